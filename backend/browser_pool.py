@@ -0,0 +1,69 @@
+"""
+Pool of pre-warmed stealth browser instances for audio extraction.
+Chrome startup dwarfs the actual download for short videos, so drivers are
+created once and checked out per extraction instead of launched per call.
+"""
+
+import asyncio
+
+from youtube_stealth import setup_stealth_driver
+
+
+class BrowserPool:
+    """
+    Async checkout/checkin pool of Selenium drivers.
+
+    Drivers are created lazily (up to `size`) in a worker thread the first
+    time they are needed, then reused across extractions so the multi-second
+    Chrome startup cost amortizes across requests. Between uses a driver has
+    its cookies cleared and is parked on about:blank.
+    """
+
+    def __init__(self, size: int, download_path: str):
+        self.size = size
+        self.download_path = download_path
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Check out a driver, creating one if the pool isn't full yet."""
+        async with self._lock:
+            if self._idle.empty() and self._created < self.size:
+                driver = await asyncio.to_thread(setup_stealth_driver, self.download_path)
+                self._created += 1
+                return driver
+        return await self._idle.get()
+
+    async def release(self, driver):
+        """Reset a driver and return it to the pool; discard it if broken."""
+        def _reset():
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+
+        try:
+            await asyncio.to_thread(_reset)
+        except Exception as e:
+            print(f"Discarding broken pooled driver: {str(e)}")
+            await self._discard(driver)
+            return
+        self._idle.put_nowait(driver)
+
+    async def _discard(self, driver):
+        async with self._lock:
+            self._created -= 1
+        try:
+            await asyncio.to_thread(driver.quit)
+        except Exception:
+            pass
+
+    async def aclose(self):
+        """Quit every idle driver. Checked-out drivers quit on release."""
+        async with self._lock:
+            while not self._idle.empty():
+                driver = self._idle.get_nowait()
+                self._created -= 1
+                try:
+                    await asyncio.to_thread(driver.quit)
+                except Exception:
+                    pass
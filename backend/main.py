@@ -4,67 +4,184 @@ Handles API endpoints and coordinates between YouTube download and ElevenLabs AP
 """
 
 import os
+import uuid
 from typing import Dict, Optional
 from fastapi import FastAPI, HTTPException, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+import msgspec
 from pydantic import BaseModel
-import requests
+import httpx
+import aiofiles
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from sse_starlette.sse import EventSourceResponse
-from asyncio import Queue
 import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    # Redis is only needed for multi-worker deployments
+    aioredis = None
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Global queue for progress updates
-progress_queue = Queue()
+# Optional shared progress backend. With several Uvicorn workers the
+# in-process JOBS dict can't be seen across workers, so when REDIS_URL is
+# set, progress is also published over Redis Pub/Sub and the SSE endpoint
+# subscribes there instead of the local registry.
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS = None  # Created in the lifespan handler when configured
+
+class ProgressChannel:
+    """
+    Per-job progress channel. Each extraction job gets its own bounded queue
+    so concurrent requests don't see each other's updates, and a slow SSE
+    consumer can't stall the extractor.
+    """
+    def __init__(self, job_id: str = ""):
+        self.job_id = job_id
+        self.q = asyncio.Queue(maxsize=256)
+        self.event = asyncio.Event()  # Set by the producer after each put
+        self.result: Optional[str] = None  # Path of the extracted audio file
+        self.error: Optional[str] = None   # Error message if extraction failed
+
+# Active extraction jobs, keyed by job UUID
+JOBS: Dict[str, ProgressChannel] = {}
+
+# Bounded pool for the blocking Selenium/yt-dlp extraction work, so it
+# never runs on the event loop and never exceeds four browsers at a time.
+# Created in the lifespan handler below.
+EXTRACT_POOL: Optional[ThreadPoolExecutor] = None
+
+class AdmissionController:
+    """
+    Condition-guarded concurrency limiter for extractions. Unlike a plain
+    Semaphore, the limit can be raised or lowered at runtime: waiters are
+    re-checked against the current limit whenever it changes.
+    """
+    def __init__(self, limit: int):
+        self.cond = asyncio.Condition()
+        self.active = 0
+        self.limit = limit
+
+    async def acquire(self):
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self):
+        async with self.cond:
+            self.active -= 1
+            self.cond.notify(1)
+
+    async def set_limit(self, limit: int):
+        async with self.cond:
+            self.limit = limit
+            self.cond.notify_all()
+
+# Cap on concurrent extractions; each one is a browser process that is
+# CPU, RAM and network heavy, and YouTube throttles too many at once.
+ADMISSION = AdmissionController(int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "2")))
 
 # Use absolute imports
 from youtube import extract_audio_from_youtube, cleanup_audio_file
-from youtube_stealth import extract_audio_stealth
+from youtube_stealth import (
+    extract_audio_direct,
+    extract_audio_stealth_with_driver,
+    is_valid_youtube_url,
+)
+from browser_pool import BrowserPool
 from voice_store import add_voice, get_voice_id, list_voices, remove_voice
 
+# Pool of pre-warmed stealth browsers; created in the lifespan handler.
+BROWSER_POOL: Optional[BrowserPool] = None
+
 # Configuration
 USE_STEALTH_MODE = os.getenv("USE_STEALTH_MODE", "true").lower() == "true"  # Default to true
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")  # Default to Vite dev server
 
-# Allow multiple frontend URLs (development and production)
+# Allow multiple frontend URLs (development and production).
+# Render subdomains are matched by the compiled regex below; Starlette's
+# CORSMiddleware does not expand wildcards inside allow_origins entries.
 ALLOWED_ORIGINS = [
     "http://localhost:5173",  # Vite default
     "http://localhost:5174",  # Vite fallback
     "http://localhost:5175",  # Vite fallback
     "http://localhost:5176",  # Confirmed frontend dev port
     FRONTEND_URL,  # Production URL from env
-    "https://frontend-basic-youtube-voice-cloning-app.onrender.com",  # Render frontend domain
-    "https://basic-youtube-voice-cloning-app.onrender.com",  # Main production domain
-    "https://*.onrender.com"  # All Render subdomains
 ]
+ALLOWED_ORIGIN_REGEX = r"^https://[a-z0-9-]+\.onrender\.com$"
 
-# Load environment variables
+# Load environment variables; validated at startup in the lifespan handler
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
-if not ELEVENLABS_API_KEY:
-    raise ValueError("ELEVENLABS_API_KEY environment variable is not set")
 
 ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1"
 
-# Ensure TEMP_AUDIO_DIR is an absolute path and exists
+# Default labels attached to every cloned voice; encoded once instead of
+# per request (multipart fields need the string form, JSON bodies the dict)
+_NEUTRAL_LABELS = {"accent": "neutral"}
+_NEUTRAL_LABELS_JSON = orjson.dumps(_NEUTRAL_LABELS).decode()
+
+# Shared async client for all ElevenLabs calls: keeps the event loop free
+# while ElevenLabs responds, reuses pooled connections, and multiplexes
+# requests over HTTP/2. Created in the lifespan handler below.
+EL_CLIENT: Optional[httpx.AsyncClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and tear down the app's shared resources."""
+    global EL_CLIENT, EXTRACT_POOL, BROWSER_POOL, REDIS
+
+    if not ELEVENLABS_API_KEY:
+        raise ValueError("ELEVENLABS_API_KEY environment variable is not set")
+
+    os.makedirs(TEMP_AUDIO_DIR, exist_ok=True)
+    print(f"Temporary audio directory configured at: {TEMP_AUDIO_DIR}")
+
+    EL_CLIENT = httpx.AsyncClient(
+        base_url=ELEVENLABS_API_URL,
+        headers={"xi-api-key": ELEVENLABS_API_KEY},
+        http2=True,
+        timeout=httpx.Timeout(60.0),
+        transport=httpx.AsyncHTTPTransport(retries=2),
+    )
+    EXTRACT_POOL = ThreadPoolExecutor(max_workers=4)
+    BROWSER_POOL = BrowserPool(
+        size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+        download_path=TEMP_AUDIO_DIR,
+    )
+    if REDIS_URL:
+        if aioredis is None:
+            raise ValueError("REDIS_URL is set but the redis package is not installed")
+        REDIS = aioredis.from_url(REDIS_URL, decode_responses=True)
+    yield
+    if REDIS is not None:
+        await REDIS.aclose()
+    await BROWSER_POOL.aclose()
+    EXTRACT_POOL.shutdown(wait=False)
+    await EL_CLIENT.aclose()
+
+# Ensure TEMP_AUDIO_DIR is an absolute path; created at startup
 TEMP_AUDIO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "temp_audio"))
-os.makedirs(TEMP_AUDIO_DIR, exist_ok=True)
-print(f"Temporary audio directory configured at: {TEMP_AUDIO_DIR}")
 
 app = FastAPI(
     title="Voice Cloning App",
     description="API for cloning voices from YouTube videos using ElevenLabs",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS for frontend
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
+    allow_origin_regex=ALLOWED_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -107,27 +224,54 @@ class SpeakRequest(BaseModel):
 class SaveVoiceRequest(BaseModel):
     name: str
 
-class AudioExtractionResponse(BaseModel):
+class ConcurrencyConfig(BaseModel):
+    max: int
+
+# Response-only shape: msgspec.Struct skips the Pydantic validation pass
+# that only matters for request models.
+class AudioExtractionResponse(msgspec.Struct):
     status: str
     message: str
-    file_path: Optional[str] = None
-    progress_updates: list[str] = []  # List of progress messages
+    job_id: Optional[str] = None  # Used to subscribe to progress updates
 
 class CloneVoiceRequest(BaseModel):
     audio_file: str
 
+async def _multipart_audio_stream(path: str, fields: Dict[str, str], boundary: str):
+    """
+    Yield a multipart/form-data body with the audio file streamed in 1 MiB
+    chunks, so multi-MB uploads never sit fully in memory.
+    """
+    for name, value in fields.items():
+        yield (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f'{value}\r\n'
+        ).encode()
+    yield (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="files"; filename="audio.mp3"\r\n'
+        f'Content-Type: audio/mpeg\r\n\r\n'
+    ).encode()
+    async with aiofiles.open(path, 'rb') as f:
+        while True:
+            chunk = await f.read(1 << 20)
+            if not chunk:
+                break
+            yield chunk
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
 async def rename_voice_in_elevenlabs(voice_id: str, name: str) -> bool:
     """
     Rename a voice in ElevenLabs.
     Returns True if successful, False otherwise.
     """
     try:
-        response = requests.patch(
-            f"{ELEVENLABS_API_URL}/voices/{voice_id}",
-            headers={"xi-api-key": ELEVENLABS_API_KEY},
+        response = await EL_CLIENT.patch(
+            f"/voices/{voice_id}",
             json={
                 "name": name,
-                "labels": {"accent": "neutral"}
+                "labels": _NEUTRAL_LABELS
             }
         )
         if response.status_code != 200:
@@ -138,81 +282,251 @@ async def rename_voice_in_elevenlabs(voice_id: str, name: str) -> bool:
         print(f"Error renaming voice in ElevenLabs: {str(e)}")
         return False
 
-async def send_progress_updates():
-    """Send progress updates through SSE."""
+async def send_progress_updates(job_id: str):
+    """Send progress updates for a single job through SSE."""
+    channel = JOBS.get(job_id)
+    if channel is None:
+        return
     try:
-        while True:
-            message = await progress_queue.get()
-            if message == "DONE":
-                break
+        done = False
+        while not done:
+            # Batch-drain whatever is queued, then wait for a single wakeup
+            # instead of round-tripping through Queue.get() per message.
+            batch = []
+            while True:
+                try:
+                    message = channel.q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if message == "DONE":
+                    done = True
+                    break
+                batch.append(message)
+            if batch:
+                # Coalesce a burst of updates into one JSON-array event so
+                # each message doesn't pay its own SSE framing and flush.
+                yield {
+                    "event": "progress",
+                    "data": orjson.dumps(batch).decode()
+                }
+            if not done:
+                channel.event.clear()
+                # The producer may have enqueued (and set the event) while
+                # the batch above was being written to the socket; waiting
+                # unconditionally would sleep through that wakeup forever.
+                if channel.q.empty():
+                    await channel.event.wait()
+        # Emit a terminal event carrying the extraction result
+        if channel.error is not None:
             yield {
-                "event": "progress",
-                "data": message
+                "event": "error",
+                "data": channel.error
+            }
+        else:
+            yield {
+                "event": "done",
+                "data": channel.result or ""
             }
     except asyncio.CancelledError:
-        # Handle client disconnection
+        # Client disconnected mid-stream; nothing left to deliver
         pass
+    finally:
+        # Drop the channel whether the stream finished or the client
+        # vanished, so abandoned jobs don't queue messages forever.
+        JOBS.pop(job_id, None)
 
-@app.get("/progress-updates")
-async def progress_updates():
-    """SSE endpoint for progress updates."""
+async def send_progress_updates_redis(job_id: str):
+    """
+    Send progress updates for a job via Redis Pub/Sub. Used when REDIS_URL
+    is configured, so SSE clients can land on any worker regardless of
+    which one runs the extraction.
+    """
+    pubsub = REDIS.pubsub()
+    await pubsub.subscribe(f"progress:{job_id}")
+    try:
+        # Pub/Sub has no replay: a fast job can publish its terminal
+        # event before the client connects. The producer persists that
+        # payload, so check it after subscribing (this order leaves no
+        # window where the terminal event can slip past both).
+        cached = await REDIS.get(f"progress-result:{job_id}")
+        if cached:
+            payload = orjson.loads(cached)
+            yield {
+                "event": payload["type"],
+                "data": payload["data"]
+            }
+            return
+        async for msg in pubsub.listen():
+            if msg["type"] != "message":
+                continue
+            payload = orjson.loads(msg["data"])
+            if payload["type"] == "progress":
+                yield {
+                    "event": "progress",
+                    "data": orjson.dumps([payload["data"]]).decode()
+                }
+            else:
+                yield {
+                    "event": payload["type"],
+                    "data": payload["data"]
+                }
+                break
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await pubsub.unsubscribe(f"progress:{job_id}")
+        await pubsub.aclose()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Don't let Nginx/Render buffer the stream
+    "Access-Control-Allow-Origin": "*",
+}
+
+@app.get("/progress-updates/{job_id}")
+async def progress_updates(job_id: str):
+    """SSE endpoint for progress updates of a single extraction job."""
+    if REDIS is not None:
+        # Cross-worker path: the job may live on another worker, so don't
+        # require a local registry entry.
+        return EventSourceResponse(
+            send_progress_updates_redis(job_id),
+            ping=15,
+            headers=SSE_HEADERS
+        )
+    if job_id not in JOBS:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
     return EventSourceResponse(
-        send_progress_updates(),
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-        }
+        send_progress_updates(job_id),
+        ping=15,  # Heartbeat so dead connections (and proxies) are noticed
+        headers=SSE_HEADERS
     )
 
-async def add_progress_update(message: str):
-    """Add a progress update to the queue."""
-    await progress_queue.put(message)
-    print(f"Progress Update: {message}")  # Add logging for debugging
-
-@app.post("/extract-audio")
-async def extract_audio(youtube_url: YouTubeURL) -> AudioExtractionResponse:
+def add_progress_update(channel: ProgressChannel, message: str):
     """
-    Extract audio from a YouTube video.
+    Add a progress update to a job's queue.
+    Non-terminal messages are dropped oldest-first when the queue is full,
+    so a slow or absent SSE consumer never blocks the extractor.
     """
-    error = None
-    audio_file = None
-    
     try:
-        # Extract audio from YouTube using the configured method
+        channel.q.put_nowait(message)
+    except asyncio.QueueFull:
+        channel.q.get_nowait()
+        channel.q.put_nowait(message)
+    channel.event.set()
+    if REDIS is not None and channel.job_id:
+        asyncio.ensure_future(REDIS.publish(
+            f"progress:{channel.job_id}",
+            orjson.dumps({"type": "progress", "data": message}).decode()))
+    print(f"Progress Update: {message}")  # Add logging for debugging
+
+async def _run_extract(job_id: str, url: str):
+    """Run the audio extraction for a job and push updates to its channel."""
+    channel = JOBS[job_id]
+    loop = asyncio.get_running_loop()
+
+    def cb(msg: str):
+        # The extractor may call back from a worker thread; hop onto the
+        # event loop without allocating a Task per message.
+        loop.call_soon_threadsafe(add_progress_update, channel, msg)
+
+    await ADMISSION.acquire()
+    try:
+        # Extract audio from YouTube using the configured method; the
+        # extractors are fully blocking, so run them in the bounded pool.
         if USE_STEALTH_MODE:
-            await add_progress_update("Setting up secure browser environment...")
-            await add_progress_update("Accessing audio converter website...")
-            await add_progress_update("Preparing to extract audio...")
-            audio_file = extract_audio_stealth(youtube_url.url, TEMP_AUDIO_DIR, 
-                progress_callback=lambda msg: asyncio.create_task(add_progress_update(msg)))
+            # Reject junk before it costs anything, then try the
+            # browserless paths (yt-dlp, converter API); a pooled browser
+            # is claimed only when those come up empty
+            if not is_valid_youtube_url(url):
+                channel.error = "Invalid YouTube URL"
+                return
+            add_progress_update(channel, "Preparing to extract audio...")
+            audio_file = await loop.run_in_executor(
+                EXTRACT_POOL,
+                lambda: extract_audio_direct(url, TEMP_AUDIO_DIR, progress_callback=cb))
+            if not audio_file:
+                add_progress_update(channel, "Setting up secure browser environment...")
+                add_progress_update(channel, "Accessing audio converter website...")
+                driver = await BROWSER_POOL.acquire()
+                try:
+                    audio_file = await loop.run_in_executor(
+                        EXTRACT_POOL,
+                        lambda: extract_audio_stealth_with_driver(
+                            driver, url, TEMP_AUDIO_DIR, progress_callback=cb))
+                finally:
+                    await BROWSER_POOL.release(driver)
         else:
-            await add_progress_update("Using standard download mode...")
-            audio_file = extract_audio_from_youtube(youtube_url.url, TEMP_AUDIO_DIR,
-                progress_callback=lambda msg: asyncio.create_task(add_progress_update(msg)))
-            
+            add_progress_update(channel, "Using standard download mode...")
+            audio_file = await loop.run_in_executor(
+                EXTRACT_POOL,
+                lambda: extract_audio_from_youtube(url, TEMP_AUDIO_DIR, progress_callback=cb))
+
         if not audio_file:
-            error = "Failed to extract audio from YouTube"
-            raise HTTPException(status_code=400, detail=error)
-            
-        await add_progress_update("Audio extraction completed successfully!")
-        await progress_queue.put("DONE")
-        
-        return AudioExtractionResponse(
-            status="success",
-            message="Audio extracted successfully",
-            file_path=audio_file,
-            progress_updates=[]  # No longer needed as we're using SSE
-        )
-        
+            channel.error = "Failed to extract audio from YouTube"
+        else:
+            channel.result = audio_file
+            add_progress_update(channel, "Audio extraction completed successfully!")
+
     except Exception as e:
-        error_msg = f"Error extracting audio: {str(e)}"
-        await add_progress_update(error_msg)
-        await progress_queue.put("DONE")
-        raise HTTPException(status_code=500, detail=error_msg)
+        channel.error = f"Error extracting audio: {str(e)}"
+    finally:
+        await ADMISSION.release()
+        # If no SSE consumer ever claims this job, don't leak its channel.
+        # Scheduled before the sentinel goes out so the expiry exists even
+        # if anything below misbehaves.
+        loop.call_later(600, JOBS.pop, job_id, None)
+        # "DONE" is the one message that must not be dropped; with no
+        # consumer the queue may be full, so evict an old progress
+        # message rather than blocking this task forever
+        try:
+            channel.q.put_nowait("DONE")
+        except asyncio.QueueFull:
+            channel.q.get_nowait()
+            channel.q.put_nowait("DONE")
+        channel.event.set()
+        if REDIS is not None:
+            if channel.error is not None:
+                payload = {"type": "error", "data": channel.error}
+            else:
+                payload = {"type": "done", "data": channel.result or ""}
+            encoded = orjson.dumps(payload).decode()
+            # Persist before publishing so a subscriber that missed the
+            # publish still finds the outcome; expires with the job
+            await REDIS.set(f"progress-result:{job_id}", encoded, ex=600)
+            await REDIS.publish(f"progress:{job_id}", encoded)
+
+@app.post("/extract-audio")
+async def extract_audio(youtube_url: YouTubeURL) -> ORJSONResponse:
+    """
+    Start extracting audio from a YouTube video.
+    Returns a job ID; progress and the final file path are delivered
+    through the /progress-updates/{job_id} SSE stream.
+    """
+    job_id = uuid.uuid4().hex
+    JOBS[job_id] = ProgressChannel(job_id)
+    asyncio.create_task(_run_extract(job_id, youtube_url.url))
+
+    response = AudioExtractionResponse(
+        status="started",
+        message="Audio extraction started",
+        job_id=job_id
+    )
+    return ORJSONResponse(msgspec.to_builtins(response))
+
+@app.post("/config")
+async def update_config(config: ConcurrencyConfig) -> Dict[str, str]:
+    """
+    Adjust the maximum number of concurrent extractions at runtime.
+    """
+    if config.max < 1:
+        raise HTTPException(status_code=400, detail="max must be at least 1")
+    await ADMISSION.set_limit(config.max)
+    return {"status": "success"}
 
 @app.post("/clone-voice")
-async def clone_voice(request: CloneVoiceRequest) -> Dict[str, str]:
+async def clone_voice(request: CloneVoiceRequest, background_tasks: BackgroundTasks) -> Dict[str, str]:
     """
     Create voice clone using ElevenLabs from an already downloaded audio file.
     """
@@ -233,44 +547,43 @@ async def clone_voice(request: CloneVoiceRequest) -> Dict[str, str]:
         print(f"Found audio file at: {audio_file}")
         
         try:
-            # Upload audio to ElevenLabs
-            with open(audio_file, 'rb') as f:
-                # Create form data
-                files = {
-                    "files": ("audio.mp3", f, "audio/mpeg")
-                }
-                form_data = {
-                    "name": "Voice Clone",
-                    "description": "Voice cloned from YouTube audio",
-                    "labels": '{"accent": "neutral"}'
-                }
-                
-                # Make the request
-                response = requests.post(
-                    f"{ELEVENLABS_API_URL}/voices/add",
-                    headers={"xi-api-key": ELEVENLABS_API_KEY},
-                    files=files,
-                    data=form_data
+            # Upload audio to ElevenLabs as a streamed multipart body
+            form_data = {
+                "name": "Voice Clone",
+                "description": "Voice cloned from YouTube audio",
+                "labels": _NEUTRAL_LABELS_JSON
+            }
+            boundary = uuid.uuid4().hex
+
+            response = await EL_CLIENT.post(
+                "/voices/add",
+                content=_multipart_audio_stream(audio_file, form_data, boundary),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+            )
+
+            # Print response for debugging
+            print(f"ElevenLabs API Response Status: {response.status_code}")
+            print(f"ElevenLabs API Response: {response.text}")
+
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"ElevenLabs API error: {response.text}"
                 )
-                
-                # Print response for debugging
-                print(f"ElevenLabs API Response Status: {response.status_code}")
-                print(f"ElevenLabs API Response: {response.text}")
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=f"ElevenLabs API error: {response.text}"
-                    )
-                
-                voice_id = response.json()["voice_id"]
-                return {"voice_id": voice_id}
-                
-        finally:
-            # Clean up the audio file after we're done with it
+
+            voice_id = orjson.loads(response.content)["voice_id"]
+
+            # Clean up the audio file after the response has been sent,
+            # keeping the unlink off the client's critical path
+            background_tasks.add_task(cleanup_audio_file, audio_file)
+            return {"voice_id": voice_id}
+
+        except Exception:
+            # On failure there is no response hook, so clean up here
             print(f"Cleaning up audio file: {audio_file}")
             cleanup_audio_file(audio_file)
-            
+            raise
+
     except Exception as e:
         print(f"Error in clone_voice: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error cloning voice: {str(e)}")
@@ -307,29 +620,39 @@ async def text_to_speech(request: SpeakRequest) -> Response:
     voice_id = get_voice_id(request.voice_name)
     if not voice_id:
         raise HTTPException(status_code=404, detail=f"Voice '{request.voice_name}' not found")
-        
-    response = requests.post(
-        f"{ELEVENLABS_API_URL}/text-to-speech/{voice_id}",
-        headers={
-            "xi-api-key": ELEVENLABS_API_KEY,
-            "Content-Type": "application/json"
-        },
+
+    # Stream the audio straight through to the client instead of buffering
+    # the whole MP3 in memory; first bytes go out as soon as ElevenLabs
+    # starts generating.
+    upstream_request = EL_CLIENT.build_request(
+        "POST",
+        f"/text-to-speech/{voice_id}",
         json={
             "text": request.text,
             "model_id": "eleven_monolingual_v1"
         }
     )
-    
-    if response.status_code != 200:
+    upstream = await EL_CLIENT.send(upstream_request, stream=True)
+
+    if upstream.status_code != 200:
+        detail = (await upstream.aread()).decode(errors="replace")
+        await upstream.aclose()
         raise HTTPException(
-            status_code=response.status_code,
-            detail=f"ElevenLabs API error: {response.text}"
+            status_code=upstream.status_code,
+            detail=f"ElevenLabs API error: {detail}"
         )
-        
-    # Return the audio data with proper content type
-    return Response(
-        content=response.content,
-        media_type="audio/mpeg"
+
+    async def tts_stream():
+        try:
+            async for chunk in upstream.aiter_bytes(65536):
+                yield chunk
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(
+        tts_stream(),
+        media_type="audio/mpeg",
+        headers={"X-Accel-Buffering": "no"}
     )
 
 @app.delete("/voices/{voice_name}")
@@ -347,9 +670,8 @@ async def delete_voice(voice_name: str) -> Dict[str, str]:
             raise HTTPException(status_code=404, detail=f"Voice '{voice_name}' not found")
             
         # Delete from ElevenLabs
-        response = requests.delete(
-            f"{ELEVENLABS_API_URL}/voices/{voice_id}",
-            headers={"xi-api-key": ELEVENLABS_API_KEY}
+        response = await EL_CLIENT.delete(
+            f"/voices/{voice_id}"
         )
         
         if response.status_code != 200:
@@ -369,4 +691,19 @@ async def delete_voice(voice_name: str) -> Dict[str, str]:
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    try:
+        import uvloop  # noqa: F401 - only probing availability
+        loop = "uvloop"
+    except ImportError:
+        # uvloop isn't available on Windows dev machines
+        loop = "asyncio"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop=loop,
+        http="httptools",
+        # The job registry and browser pool are in-process, so keep one
+        # worker unless progress state is moved to a shared backend.
+        workers=int(os.getenv("WORKERS", "1")),
+    )
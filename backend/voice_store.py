@@ -3,40 +3,128 @@ Module for managing voice IDs and their associated names.
 Uses a simple in-memory dictionary for development.
 """
 
+import atexit
 import json
+import logging
 import os
+import threading
 from typing import Dict, Optional
 
-# Path to the JSON file
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib codec when orjson isn't installed
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    # Fall back to JSON on disk when msgpack isn't installed
+    msgpack = None
+
+def _dumps(data: Dict[str, str]) -> bytes:
+    """Serialize the store compactly; msgpack, then orjson, when available."""
+    if msgpack is not None:
+        return msgpack.packb(data)
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+def _loads(content) -> Dict[str, str]:
+    """Parse the stored form; msgpack, then orjson, when available."""
+    if msgpack is not None:
+        return msgpack.unpackb(content, raw=False)
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+# On-disk paths: msgpack when the codec is available (smaller and much
+# cheaper to parse than JSON), with the legacy JSON file kept around as
+# a one-time migration source
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-VOICE_STORE_FILE = os.path.join(BASE_DIR, "voice_store.json")
+_JSON_STORE_FILE = os.path.join(BASE_DIR, "voice_store.json")
+_MSGPACK_STORE_FILE = os.path.join(BASE_DIR, "voice_store.msgpack")
+VOICE_STORE_FILE = _MSGPACK_STORE_FILE if msgpack is not None else _JSON_STORE_FILE
 
-# In-memory cache for voices
+# In-memory cache for voices, with the mtime of the file it was parsed
+# from so repeat loads are a no-op unless the file actually changed
 VOICE_STORE: Dict[str, str] = {}
+_CACHE_MTIME: float = 0.0
+
+# Sentinel distinguishing "absent" from a stored falsy value
+_MISSING = object()
+
+# Write-back state: mutations mark the store dirty and schedule a short
+# debounced flush, so a burst of changes costs one file rewrite, not N
+_DIRTY = False
+_FLUSH_DELAY = 0.5  # Seconds to wait for further mutations before writing
+_FLUSH_TIMER: Optional[threading.Timer] = None
+_FLUSH_LOCK = threading.Lock()
+
+def flush() -> None:
+    """
+    Write the store to disk if there are unsaved mutations.
+    Also registered with atexit so pending changes survive shutdown.
+    """
+    global _DIRTY
+    with _FLUSH_LOCK:
+        if not _DIRTY:
+            return
+        _DIRTY = False
+    save_voices_to_file()
+
+def _mark_dirty() -> None:
+    """Flag unsaved changes and (re)schedule the debounced flush."""
+    global _DIRTY, _FLUSH_TIMER
+    with _FLUSH_LOCK:
+        _DIRTY = True
+        if _FLUSH_TIMER is not None:
+            _FLUSH_TIMER.cancel()
+        _FLUSH_TIMER = threading.Timer(_FLUSH_DELAY, flush)
+        _FLUSH_TIMER.daemon = True
+        _FLUSH_TIMER.start()
 
 def load_voices() -> Dict[str, str]:
     """
     Load voice mappings from the JSON file.
-    Populates the in-memory VOICE_STORE.
-    
+    Populates the in-memory VOICE_STORE; skips the re-read and re-parse
+    entirely when the file hasn't changed since the last load.
+
     Returns:
         Dictionary mapping voice names to their IDs
     """
-    global VOICE_STORE
+    global VOICE_STORE, _CACHE_MTIME
     try:
+        if (msgpack is not None and not os.path.exists(_MSGPACK_STORE_FILE)
+                and os.path.exists(_JSON_STORE_FILE)):
+            # One-time migration from the legacy JSON store
+            with open(_JSON_STORE_FILE, "rb") as f:
+                VOICE_STORE = json.loads(f.read() or b"{}")
+            save_voices_to_file()
+            print(f"Info: Migrated voice store from {_JSON_STORE_FILE} to {VOICE_STORE_FILE}.")
+            return VOICE_STORE
         if os.path.exists(VOICE_STORE_FILE):
-            with open(VOICE_STORE_FILE, 'r') as f:
-                content = f.read()
-                if not content: # Handle empty file
-                    VOICE_STORE = {}
-                    return VOICE_STORE
-                VOICE_STORE = json.loads(content)
+            st = os.stat(VOICE_STORE_FILE)
+            if st.st_mtime == _CACHE_MTIME:
+                return VOICE_STORE
+            # Read the whole file in one syscall, then parse the buffer;
+            # no TextIOWrapper or incremental buffered reads involved
+            fd = os.open(VOICE_STORE_FILE, os.O_RDONLY)
+            try:
+                content = os.read(fd, st.st_size)
+            finally:
+                os.close(fd)
+            if not content: # Handle empty file
+                VOICE_STORE = {}
+            else:
+                VOICE_STORE = _loads(content)
+            _CACHE_MTIME = st.st_mtime
         else:
             # If file doesn't exist, start with an empty store and create the file
             VOICE_STORE = {}
             save_voices_to_file() 
             print(f"Info: {VOICE_STORE_FILE} not found. Initializing with an empty voice store.")
-    except (json.JSONDecodeError, IOError) as e:
+    except (ValueError, IOError) as e:  # covers JSON and msgpack decode errors
         print(f"Warning: Could not load voices from {VOICE_STORE_FILE}. Error: {e}. Starting with an empty voice store.")
         VOICE_STORE = {} # Reset to empty on error
     return VOICE_STORE
@@ -44,10 +132,23 @@ def load_voices() -> Dict[str, str]:
 def save_voices_to_file() -> None:
     """
     Save the current in-memory VOICE_STORE to the JSON file.
+    Serializes to one buffer and writes it through a temp file followed by
+    os.replace, so a crash mid-save can never leave a corrupt store and
+    the write is a single syscall instead of one per JSON token.
     """
+    global _CACHE_MTIME
+    tmp_file = VOICE_STORE_FILE + ".tmp"
     try:
-        with open(VOICE_STORE_FILE, 'w') as f:
-            json.dump(VOICE_STORE, f, indent=4)
+        data = _dumps(VOICE_STORE)
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, VOICE_STORE_FILE)
+        # The in-memory store already matches what we wrote
+        _CACHE_MTIME = os.stat(VOICE_STORE_FILE).st_mtime
     except IOError as e:
         print(f"Error: Could not save voices to {VOICE_STORE_FILE}. Error: {e}")
 
@@ -60,7 +161,7 @@ def add_voice(name: str, voice_id: str) -> None:
         voice_id: ElevenLabs voice ID
     """
     VOICE_STORE[name] = voice_id
-    save_voices_to_file()
+    _mark_dirty()
 
 def get_voice_id(name: str) -> Optional[str]:
     """
@@ -93,12 +194,15 @@ def remove_voice(name: str) -> bool:
     Returns:
         True if voice was removed, False if not found
     """
-    if name in VOICE_STORE:
-        del VOICE_STORE[name]
-        save_voices_to_file()
-        return True
-    return False
+    removed = VOICE_STORE.pop(name, _MISSING)
+    if removed is _MISSING:
+        return False
+    _mark_dirty()
+    return True
+
+# Flush any pending write-back on interpreter shutdown
+atexit.register(flush)
 
 # Initial load of voices when the module is imported
 load_voices()
-print(f"Voice store initialized. Loaded voices: {list(VOICE_STORE.keys())}") 
\ No newline at end of file
+logging.getLogger(__name__).debug("Voice store initialized with %d voices", len(VOICE_STORE))
@@ -6,7 +6,27 @@ import os
 import re
 import time
 import random
+import asyncio
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
 from typing import Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Fall back to directory polling when watchdog isn't installed
+    Observer = None
+    FileSystemEventHandler = object
+
+try:
+    import yt_dlp
+except ImportError:
+    # Fall back to browser automation when yt-dlp isn't installed
+    yt_dlp = None
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -16,26 +36,27 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Standard, embed, short-link and Shorts URLs, combined into one pattern
+# compiled once at import so each lookup is a single scan
+_VIDEO_ID_RE = re.compile(r'(?:v=|/v/|/embed/|youtu\.be/|youtube\.com/shorts/)([^&?/]+)')
+
+# Human-mimicry (random waits, mouse wiggles) adds 2-5s of pure sleep per
+# extraction; keep it off unless cnvmp3.com actually starts rejecting us.
+# Failed browser attempts automatically retry once with it enabled.
+ANTI_BOT = os.environ.get("YT_ANTIBOT", "0") == "1"
+
 def get_video_id(url: str) -> Optional[str]:
     """
     Extract video ID from YouTube URL.
-    
+
     Args:
         url: YouTube video URL
-        
+
     Returns:
         Video ID if found, None otherwise
     """
-    patterns = [
-        r'(?:v=|/v/|/embed/|youtu\.be/)([^&?/]+)',  # Standard and embed URLs
-        r'(?:youtube\.com/shorts/)([^&?/]+)',        # YouTube Shorts
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
 def get_random_viewport_size():
     """
@@ -67,11 +88,11 @@ def add_random_mouse_movement(driver):
     Simulate natural mouse movements.
     """
     action = ActionChains(driver)
-    
-    # Get viewport size
-    viewport_width = driver.execute_script("return window.innerWidth;")
-    viewport_height = driver.execute_script("return window.innerHeight;")
-    
+
+    # Viewport size is fixed after window setup, so use the dimensions
+    # cached on the driver instead of two JS round-trips per call
+    viewport_width, viewport_height = getattr(driver, '_viewport', (800, 600))
+
     # Generate random points for natural-looking movement
     points = [(random.randint(0, viewport_width), random.randint(0, viewport_height)) for _ in range(3)]
     
@@ -82,6 +103,20 @@ def add_random_mouse_movement(driver):
     
     action.perform()
 
+# Resolved chromedriver binary path, memoized across calls
+_DRIVER_PATH: Optional[str] = None
+
+def _get_chromedriver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process.
+    ChromeDriverManager().install() does version checks over the network
+    and filesystem scans even on cache hits, so repeat calls skip it.
+    """
+    global _DRIVER_PATH
+    if _DRIVER_PATH is None:
+        _DRIVER_PATH = ChromeDriverManager().install()
+    return _DRIVER_PATH
+
 def setup_chrome_driver(download_path: str) -> webdriver.Chrome:
     """
     Set up Chrome WebDriver with sophisticated anti-detection measures.
@@ -134,6 +169,10 @@ def setup_chrome_driver(download_path: str) -> webdriver.Chrome:
         'download.directory_upgrade': True,
         'safebrowsing.enabled': True,
         'profile.default_content_settings.popups': 0,
+        # The converter only needs its URL input and button; skip loading
+        # images and stylesheets to cut page bytes and layout work
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 2,
         'profile.password_manager_enabled': True,
         'credentials_enable_service': True,
         # Add common plugins to look more realistic
@@ -152,11 +191,17 @@ def setup_chrome_driver(download_path: str) -> webdriver.Chrome:
     }
     
     chrome_options.add_experimental_option('prefs', prefs)
-    
+
     # Initialize the Chrome WebDriver
-    service = Service(ChromeDriverManager().install())
+    service = Service(_get_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
-    
+
+    # Cache the viewport once; it never changes for the driver's lifetime
+    driver._viewport = (
+        driver.execute_script("return window.innerWidth;"),
+        driver.execute_script("return window.innerHeight;"),
+    )
+
     # Execute CDP commands to modify browser fingerprint
     driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
         'source': '''
@@ -198,99 +243,364 @@ def setup_chrome_driver(download_path: str) -> webdriver.Chrome:
     
     return driver
 
-def extract_audio_from_youtube(url: str, output_path: str) -> Optional[str]:
+# Pool of warm Chrome instances reused across extractions; launching a
+# fresh headless Chrome dominates the cost of short conversions
+_DRIVER_POOL: queue.Queue = queue.Queue()
+_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "2"))
+_POOL_COUNT = 0
+_POOL_LOCK = threading.Lock()
+
+@contextmanager
+def acquire_driver(download_path: str):
     """
-    Extract audio from YouTube video using cnvmp3.com via browser automation.
-    
+    Check a pooled driver out for one extraction.
+    Reuses a warm Chrome when one is idle (re-pointing its download dir
+    via CDP), otherwise launches a new one; returns it to the pool with
+    cookies cleared, or quits it if the extraction broke it.
+    """
+    global _POOL_COUNT
+    try:
+        driver = _DRIVER_POOL.get_nowait()
+        driver.execute_cdp_cmd('Page.setDownloadBehavior', {
+            'behavior': 'allow',
+            'downloadPath': download_path,
+        })
+    except queue.Empty:
+        driver = setup_chrome_driver(download_path)
+        with _POOL_LOCK:
+            _POOL_COUNT += 1
+    try:
+        yield driver
+    except Exception:
+        _discard_driver(driver)
+        raise
+    else:
+        _release_driver(driver)
+
+def _release_driver(driver) -> None:
+    """Reset a driver and park it, or quit it if the pool is full."""
+    global _POOL_COUNT
+    try:
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    except Exception:
+        _discard_driver(driver)
+        return
+    with _POOL_LOCK:
+        if _POOL_COUNT > _POOL_SIZE:
+            _POOL_COUNT -= 1
+            keep = False
+        else:
+            keep = True
+    if keep:
+        _DRIVER_POOL.put_nowait(driver)
+    else:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+def _discard_driver(driver) -> None:
+    global _POOL_COUNT
+    with _POOL_LOCK:
+        _POOL_COUNT -= 1
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+def _shutdown_driver_pool() -> None:
+    """Quit every idle pooled driver at interpreter exit."""
+    while True:
+        try:
+            driver = _DRIVER_POOL.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+atexit.register(_shutdown_driver_pool)
+
+def _extract_audio_with_ytdlp(url: str, output_path: str,
+                              progress_callback=None) -> str:
+    """
+    Download the audio track directly with yt-dlp and convert it to mp3.
+    No browser involved: one in-process downloader plus an ffmpeg pass.
+
     Args:
         url: YouTube video URL
         output_path: Directory where the audio file will be saved
-        
+
+    Returns:
+        Path to the downloaded mp3
+
+    Raises:
+        Exception: On any yt-dlp extraction or download failure
+    """
+    if progress_callback:
+        progress_callback("Downloading audio track...")
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': os.path.join(output_path, '%(id)s.%(ext)s'),
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            # VBR quality 2 (~190 kbps) encodes roughly twice as fast
+            # as fixed 192k CBR at equivalent quality
+            'preferredquality': '2',
+        }],
+        # Let lame use every core for the unavoidable mp3 encode
+        'postprocessor_args': ['-threads', '0'],
+        'noplaylist': True,
+        'quiet': True,
+        # Parallel fragment fetches with 10 MiB chunks keep segmented
+        # (HLS/DASH) downloads from running one fragment at a time
+        'concurrent_fragment_downloads': 8,
+        'http_chunk_size': 10485760,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=True)
+        base = os.path.splitext(ydl.prepare_filename(info))[0]
+    return base + '.mp3'
+
+def extract_audio_from_youtube(url: str, output_path: str,
+                               progress_callback=None) -> Optional[str]:
+    """
+    Extract audio from a YouTube video.
+    Prefers yt-dlp, which skips the whole headless-browser pipeline; the
+    cnvmp3.com browser automation remains as a fallback.
+
+    Args:
+        url: YouTube video URL
+        output_path: Directory where the audio file will be saved
+        progress_callback: Optional callback function to report progress
+
     Returns:
         Path to the downloaded audio file or None if extraction fails
     """
-    try:
-        # Create output directory if it doesn't exist
-        os.makedirs(output_path, exist_ok=True)
-        
-        # Extract video ID for filename tracking
-        video_id = get_video_id(url)
-        if not video_id:
-            print("Invalid YouTube URL")
-            return None
-        
-        # Set up Chrome WebDriver
-        driver = setup_chrome_driver(os.path.abspath(output_path))
-        
+    # Create output directory if it doesn't exist
+    os.makedirs(output_path, exist_ok=True)
+
+    # Extract video ID for filename tracking
+    video_id = get_video_id(url)
+    if not video_id:
+        print("Invalid YouTube URL")
+        return None
+
+    if yt_dlp is not None:
         try:
-            # Navigate to the converter website with random timing
+            audio_file = _extract_audio_with_ytdlp(url, output_path, progress_callback)
+            print(f"Download completed: {audio_file}")
+            return audio_file
+        except Exception as e:
+            print(f"yt-dlp extraction failed: {str(e)}. Falling back to browser automation.")
+            if progress_callback:
+                progress_callback("Direct download failed, trying converter website...")
+
+    audio_file = _extract_audio_via_browser(url, output_path)
+    if audio_file is None and not ANTI_BOT:
+        # The converter may be bot-checking us; retry once with the
+        # human-mimicry delays enabled
+        print("Browser extraction failed, retrying with anti-bot measures...")
+        if progress_callback:
+            progress_callback("Retrying extraction...")
+        audio_file = _extract_audio_via_browser(url, output_path, anti_bot=True)
+    return audio_file
+
+def _wait_for_element(driver, css_selector: str, timeout: int = 10):
+    """
+    Block until css_selector matches, then return the element.
+    A single async script with a MutationObserver resolves the moment the
+    node appears, instead of WebDriverWait's 500ms polling round-trips.
+    """
+    driver.set_script_timeout(timeout)
+    driver.execute_async_script(
+        "const done = arguments[arguments.length - 1];"
+        "const sel = arguments[0];"
+        "const q = () => document.querySelector(sel);"
+        "if (q()) { done(true); return; }"
+        "new MutationObserver((_, obs) => {"
+        "  if (q()) { obs.disconnect(); done(true); }"
+        "}).observe(document, {childList: true, subtree: true});",
+        css_selector)
+    return driver.find_element(By.CSS_SELECTOR, css_selector)
+
+# Gate for concurrent async extractions; created lazily so it binds to
+# the running event loop, sized to match the driver pool
+_EXTRACT_SEMAPHORE: Optional[asyncio.Semaphore] = None
+
+async def extract_audio_from_youtube_async(url: str, output_path: str,
+                                           progress_callback=None) -> Optional[str]:
+    """
+    Async wrapper around extract_audio_from_youtube.
+    Runs the blocking extraction in a worker thread so many URLs can
+    overlap, bounded by the driver-pool size.
+
+    Args:
+        url: YouTube video URL
+        output_path: Directory where the audio file will be saved
+        progress_callback: Optional callback function to report progress
+
+    Returns:
+        Path to the downloaded audio file or None if extraction fails
+    """
+    global _EXTRACT_SEMAPHORE
+    if _EXTRACT_SEMAPHORE is None:
+        _EXTRACT_SEMAPHORE = asyncio.Semaphore(_POOL_SIZE)
+    async with _EXTRACT_SEMAPHORE:
+        return await asyncio.to_thread(
+            extract_audio_from_youtube, url, output_path, progress_callback)
+
+def _extract_audio_via_browser(url: str, output_path: str,
+                               anti_bot: Optional[bool] = None) -> Optional[str]:
+    """
+    Extract audio using cnvmp3.com via browser automation.
+
+    Args:
+        url: YouTube video URL
+        output_path: Directory where the audio file will be saved
+        anti_bot: Enable human-mimicry delays and mouse movements;
+            defaults to the module-level ANTI_BOT flag
+
+    Returns:
+        Path to the downloaded audio file or None if extraction fails
+    """
+    if anti_bot is None:
+        anti_bot = ANTI_BOT
+    try:
+        # Snapshot the directory so only this download's file is matched
+        pre_existing = set(os.listdir(output_path))
+
+        # Check a warm Chrome WebDriver out of the pool
+        with acquire_driver(os.path.abspath(output_path)) as driver:
+            # Navigate to the converter website
             print("Accessing converter website...(main)")
             driver.get("https://cnvmp3.com/")
-            time.sleep(random.uniform(1, 2))  # Random initial wait
-            
-            # Add some random mouse movements
-            add_random_mouse_movement(driver)
-            
+            if anti_bot:
+                time.sleep(random.uniform(1, 2))  # Random initial wait
+                add_random_mouse_movement(driver)
+
             # Wait for and find the URL input field
-            url_input = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "input-field-url"))
-            )
-            
-            # Enter the YouTube URL with human-like typing
+            url_input = _wait_for_element(driver, ".input-field-url")
+
+            # Enter the YouTube URL in one round-trip instead of a
+            # keystroke (and sleep) per character
             url_input.clear()
-            for char in url:
-                url_input.send_keys(char)
-                time.sleep(random.uniform(0.01, 0.03))  # Random typing delay
-            
-            time.sleep(random.uniform(0.5, 1))  # Random pause after typing
-            
-            # More random mouse movements
-            add_random_mouse_movement(driver)
-            
+            driver.execute_script(
+                "arguments[0].value = arguments[1];"
+                "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));",
+                url_input, url)
+
+            if anti_bot:
+                time.sleep(random.uniform(0.3, 0.7))  # Short pause after typing
+                add_random_mouse_movement(driver)
+
             # Find and click the convert button
             convert_button = WebDriverWait(driver, 10).until(
                 EC.element_to_be_clickable((By.ID, "convert-button-1"))
             )
-            
+
             # Move to button naturally and click
             action = ActionChains(driver)
             action.move_to_element(convert_button)
-            action.pause(random.uniform(0.1, 0.3))
+            if anti_bot:
+                action.pause(random.uniform(0.1, 0.3))
             action.click()
             action.perform()
             
-            # Wait for download to complete with random checking intervals
+            # Wait for the download to land in the output directory
             print("Waiting for download to complete...")
-            max_wait = 60
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait:
-                # Check for downloaded files
-                files = os.listdir(output_path)
-                mp3_files = [f for f in files if f.endswith('.mp3')]
-                
-                if mp3_files:
-                    # Get the most recently downloaded file
-                    latest_file = max([os.path.join(output_path, f) for f in mp3_files], 
-                                    key=os.path.getctime)
-                    print(f"Download completed: {latest_file}")
-                    return latest_file
-                
-                time.sleep(random.uniform(0.5, 1.5))  # Random check interval
-            
+            latest_file = wait_for_download(output_path, max_wait=60,
+                                            pre_existing=pre_existing)
+            if latest_file:
+                print(f"Download completed: {latest_file}")
+                return latest_file
+
             print("Timeout waiting for download")
             return None
-            
-        finally:
-            # Add final random movements before closing
-            add_random_mouse_movement(driver)
-            time.sleep(random.uniform(0.5, 1))
-            driver.quit()
-            
+
     except Exception as e:
         print(f"Error extracting audio: {str(e)}")
         return None
 
+class _Mp3DownloadHandler(FileSystemEventHandler):
+    """Flags the first new .mp3 that lands in the watched download directory."""
+
+    def __init__(self, pre_existing: set):
+        self.pre_existing = pre_existing
+        self.latest: Optional[str] = None
+        self.found = threading.Event()
+
+    def _check(self, path: str) -> None:
+        if path.endswith('.mp3') and os.path.basename(path) not in self.pre_existing:
+            self.latest = path
+            self.found.set()
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._check(event.src_path)
+
+    def on_moved(self, event):
+        # Chrome downloads to a .crdownload file and renames it when done
+        if not event.is_directory:
+            self._check(event.dest_path)
+
+def wait_for_download(output_path: str, max_wait: int = 60,
+                      pre_existing: Optional[set] = None) -> Optional[str]:
+    """
+    Block until a new mp3 appears in output_path or max_wait elapses.
+    Uses filesystem events (watchdog) when available, so the file is seen
+    the instant it lands; falls back to polling otherwise.
+
+    Args:
+        output_path: Directory being downloaded into
+        max_wait: Maximum seconds to wait
+        pre_existing: Filenames present before the download started;
+            anything in this set is never returned, so a stale mp3 from
+            an earlier run can't be mistaken for this download
+
+    Returns:
+        Path of the downloaded mp3 or None on timeout
+    """
+    pre = pre_existing if pre_existing is not None else set()
+
+    def _find_new_mp3() -> Optional[str]:
+        # scandir serves names and paths out of one getdents pass, with no
+        # per-file stat or os.path.join
+        with os.scandir(output_path) as it:
+            for entry in it:
+                if entry.name.endswith('.mp3') and entry.name not in pre:
+                    return entry.path
+        return None
+
+    if Observer is not None:
+        handler = _Mp3DownloadHandler(pre)
+        observer = Observer()
+        observer.schedule(handler, output_path)
+        observer.start()
+        try:
+            # The file may have landed before the observer started
+            landed = _find_new_mp3()
+            if landed:
+                return landed
+            if handler.found.wait(timeout=max_wait):
+                return handler.latest
+            return None
+        finally:
+            observer.stop()
+            observer.join()
+
+    # Polling fallback: a set difference per tick, no stat calls
+    start_time = time.time()
+    while time.time() - start_time < max_wait:
+        landed = _find_new_mp3()
+        if landed:
+            return landed
+        time.sleep(random.uniform(0.5, 1.5))  # Random check interval
+    return None
+
 def cleanup_audio_file(file_path: str) -> None:
     """
     Remove downloaded audio file to free up space.
@@ -3,65 +3,99 @@ Module for handling YouTube video audio extraction using cnvmp3.com via stealth
 This version implements advanced anti-detection measures for cloud deployment.
 """
 
+from __future__ import annotations
+
 import os
 import re
 import time
 import random
-from typing import Optional, Tuple
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
+import asyncio
+import atexit
+import threading
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import requests
+
+# selenium and webdriver-manager cost a couple hundred ms of import time
+# and several MB of memory, yet the yt-dlp and direct-API paths never
+# touch them; each browser-path function imports what it needs on entry
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+try:
+    import yt_dlp
+except ImportError:
+    # Fall back to the stealth browser flow when yt-dlp isn't installed
+    yt_dlp = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Fall back to directory polling when watchdog isn't installed
+    Observer = None
+    FileSystemEventHandler = object
+
+# Standard, embed, short-link and Shorts URLs in one alternation,
+# compiled once instead of rebuilt on every call
+_VIDEO_ID_RE = re.compile(r'(?:v=|/v/|/embed/|youtu\.be/|youtube\.com/shorts/)([^&?/]+)')
+
+# Only real YouTube hosts get past the front door; a malformed URL that
+# happens to contain "v=" would otherwise pay for a Chrome launch and
+# the full download timeout before failing
+_YT_URL_RE = re.compile(r'^https?://(www\.|m\.)?(youtube\.com|youtu\.be)/')
+
+def is_valid_youtube_url(url: str) -> bool:
+    """True when url points at a real YouTube host with a parseable video ID."""
+    return bool(_YT_URL_RE.match(url) and get_video_id(url))
 
 def get_video_id(url: str) -> Optional[str]:
     """Extract video ID from YouTube URL."""
-    patterns = [
-        r'(?:v=|/v/|/embed/|youtu\.be/)([^&?/]+)',  # Standard and embed URLs
-        r'(?:youtube\.com/shorts/)([^&?/]+)',        # YouTube Shorts
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+# Identity pools frozen at module scope: no per-call list rebuild, and a
+# driver keeps the identity it was created with for its whole lifetime
+# (rotating UA mid-session is itself a bot signal)
+_VIEWPORT_POOL: Tuple[Tuple[int, int], ...] = (
+    (1366, 768),   # Common laptop
+    (1280, 720),   # HD
+    (1024, 768),   # Standard
+)
+
+_USER_AGENT_POOL: Tuple[str, ...] = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+)
 
 def get_random_viewport_size() -> Tuple[int, int]:
     """Return a conservative, realistic viewport size."""
-    viewports = [
-        (1366, 768),   # Common laptop
-        (1280, 720),   # HD
-        (1024, 768),   # Standard
-    ]
-    return random.choice(viewports)
+    return random.choice(_VIEWPORT_POOL)
 
 def get_random_user_agent() -> str:
     """Return a random, recent Chrome user agent."""
-    agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-    ]
-    return random.choice(agents)
+    return random.choice(_USER_AGENT_POOL)
 
 def simulate_human_interaction(driver: webdriver.Chrome) -> None:
     """Simulate natural human-like interactions with bounds checking."""
+    from selenium.webdriver.common.action_chains import ActionChains
+
     try:
         action = ActionChains(driver)
         
-        # Get viewport size with fallback values
-        try:
-            viewport_width = driver.execute_script("return Math.min(window.innerWidth, document.documentElement.clientWidth);") or 800
-            viewport_height = driver.execute_script("return Math.min(window.innerHeight, document.documentElement.clientHeight);") or 600
-        except:
-            viewport_width = 800
-            viewport_height = 600
+        # Viewport was fixed at driver setup; use the cached tuple and
+        # only fall back to a JS query for drivers created elsewhere
+        viewport_width, viewport_height = getattr(driver, '_viewport', (0, 0))
+        if not viewport_width:
+            try:
+                viewport_width = driver.execute_script("return Math.min(window.innerWidth, document.documentElement.clientWidth);") or 800
+                viewport_height = driver.execute_script("return Math.min(window.innerHeight, document.documentElement.clientHeight);") or 600
+            except:
+                viewport_width = 800
+                viewport_height = 600
         
         # Use very conservative bounds (central 50% of viewport)
         safe_width = min(viewport_width // 2, 400)  # Half of viewport, max 400px
@@ -82,45 +116,89 @@ def simulate_human_interaction(driver: webdriver.Chrome) -> None:
             y = random.randint(start_y, start_y + safe_height)
             points.append((x, y))
         
-        # Reset mouse to center
-        action.move_by_offset(center_x, center_y).perform()
-        time.sleep(random.uniform(0.1, 0.2))
-        
-        # Move through points with natural delays
+        # Plan the whole path up front: every step offset and pause is
+        # computed before the chain is built, so no RNG or geometry work
+        # interleaves with assembling the gesture
+        path = []  # (dx, dy, pause) per step
         current_x = center_x
         current_y = center_y
-        
         for x, y in points:
-            # Calculate relative movement
             delta_x = x - current_x
             delta_y = y - current_y
-            
-            # Move in smaller steps
             steps = random.randint(2, 3)
-            for step in range(steps):
-                step_x = delta_x // steps
-                step_y = delta_y // steps
-                action.move_by_offset(step_x, step_y)
-                action.pause(random.uniform(0.05, 0.1))
-            
+            path.extend((delta_x // steps, delta_y // steps,
+                         random.uniform(0.05, 0.1)) for _ in range(steps))
             current_x = x
             current_y = y
-        
+
+        # One chain, one perform(): center reset, the planned steps,
+        # then a trailing pause, all executed driver-side
+        action.move_by_offset(center_x, center_y)
+        action.pause(random.uniform(0.1, 0.2))
+        for dx, dy, pause in path:
+            action.move_by_offset(dx, dy)
+            action.pause(pause)
+        action.pause(random.uniform(0.2, 0.3))
         action.perform()
-        time.sleep(random.uniform(0.2, 0.3))
-        
+
     except Exception as e:
         print(f"Warning: Mouse movement simulation failed: {str(e)}")
         # Continue execution even if mouse movement fails
 
+# CDP payload injected into every new document, built once at import
+# instead of re-assembled per driver launch. The plugins override stays
+# minimal on purpose: an elaborate fake plugin list is itself a shape
+# detectors key on
+_STEALTH_SCRIPT = {
+    'source': '''
+        // Override navigator properties
+        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+
+        // Add language settings
+        Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
+
+        // Modify WebGL fingerprint
+        const getParameter = WebGLRenderingContext.prototype.getParameter;
+        WebGLRenderingContext.prototype.getParameter = function(parameter) {
+            if (parameter === 37445) {
+                return 'Intel Inc.';
+            }
+            if (parameter === 37446) {
+                return 'Intel(R) Iris(TM) Graphics 6100';
+            }
+            return getParameter.apply(this, arguments);
+        };
+    '''
+}
+
+# Resolved chromedriver binary path, memoized across driver launches
+_CHROMEDRIVER_PATH: Optional[str] = None
+
+def _get_chromedriver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process.
+    webdriver-manager re-checks versions over the network and rescans its
+    cache on every install() call, so repeat driver launches skip it.
+    """
+    global _CHROMEDRIVER_PATH
+    if _CHROMEDRIVER_PATH is None:
+        from webdriver_manager.chrome import ChromeDriverManager
+        _CHROMEDRIVER_PATH = ChromeDriverManager().install()
+    return _CHROMEDRIVER_PATH
+
 def setup_stealth_driver(download_path: str) -> webdriver.Chrome:
     """Set up Chrome WebDriver with advanced anti-detection measures."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
     chrome_options = Options()
     
-    # Set random viewport and user agent
+    # Pick the viewport and user agent once for this driver's lifetime
     width, height = get_random_viewport_size()
+    user_agent = get_random_user_agent()
     chrome_options.add_argument(f'--window-size={width},{height}')
-    chrome_options.add_argument(f'--user-agent={get_random_user_agent()}')
+    chrome_options.add_argument(f'--user-agent={user_agent}')
     
     # Headless mode with modern settings
     chrome_options.add_argument('--headless=new')
@@ -131,15 +209,14 @@ def setup_stealth_driver(download_path: str) -> webdriver.Chrome:
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
     
-    # Mimic real browser behavior
-    chrome_options.add_argument('--start-maximized')
-    chrome_options.add_argument('--enable-javascript')
-    chrome_options.add_argument('--lang=en-US,en;q=0.9')
-    chrome_options.add_argument('--disable-gpu')
+    # Container/cloud necessities. --start-maximized, --enable-javascript
+    # and --disable-gpu are dropped: headless=new handles them natively,
+    # and non-default flags show up in the automation fingerprint
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--no-sandbox')
-    
-    # Set up download behavior and preferences
+
+    # Set up download behavior and preferences; language lives here
+    # rather than in a --lang switch
     prefs = {
         'download.default_directory': download_path,
         'download.prompt_for_download': False,
@@ -147,125 +224,267 @@ def setup_stealth_driver(download_path: str) -> webdriver.Chrome:
         'safebrowsing.enabled': True,
         'profile.default_content_settings.popups': 0,
         'plugins.always_open_pdf_externally': True,
+        'intl.accept_languages': 'en-US,en;q=0.9',
+        # Submitting a URL and clicking convert needs no images; skip
+        # fetching and decoding them (keep stylesheets and cookies so
+        # the page still behaves normally)
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 1,
+        'profile.default_content_setting_values.cookies': 1,
     }
     chrome_options.add_experimental_option('prefs', prefs)
+
+    # Return from driver.get() at DOMContentLoaded instead of waiting for
+    # the full load event, skipping lazy image/analytics tails
+    chrome_options.page_load_strategy = 'eager'
     
-    # Initialize WebDriver
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    # Inject scripts to modify browser fingerprint
-    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-        'source': '''
-            // Override navigator properties
-            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-            
-            // Add common plugins
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [
-                    {
-                        0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "PDF Document"},
-                        description: "PDF Document",
-                        filename: "internal-pdf-viewer",
-                        length: 1,
-                        name: "Chrome PDF Plugin"
-                    }
-                ]
-            });
-            
-            // Add language settings
-            Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
-            
-            // Modify WebGL fingerprint
-            const getParameter = WebGLRenderingContext.prototype.getParameter;
-            WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                if (parameter === 37445) {
-                    return 'Intel Inc.';
-                }
-                if (parameter === 37446) {
-                    return 'Intel(R) Iris(TM) Graphics 6100';
-                }
-                return getParameter.apply(this, arguments);
-            };
-        '''
-    })
+    # Initialize WebDriver. keep_alive reuses one HTTP connection to
+    # chromedriver for every WebDriver command instead of reconnecting,
+    # which matters for command-heavy flows like element polling
+    service = Service(_get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options,
+                              keep_alive=True)
+
+    # Remember the chosen identity so reuse keeps it stable and helpers
+    # can read the viewport without a JS round-trip
+    driver._chosen_ua = user_agent
+    driver._viewport = (width, height)
     
+    # Inject the precomputed fingerprint script
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', _STEALTH_SCRIPT)
+
     return driver
 
-def extract_audio_stealth(url: str, output_path: str, progress_callback=None) -> Optional[str]:
+class _Mp3CreatedHandler(FileSystemEventHandler):
+    """Signals an event the moment a new .mp3 lands in the watched directory."""
+
+    def __init__(self, pre_existing: set):
+        self.pre_existing = pre_existing
+        self.created = threading.Event()
+        self.path: Optional[str] = None
+
+    def _check(self, path: str) -> None:
+        if path.endswith('.mp3') and os.path.basename(path) not in self.pre_existing:
+            self.path = path
+            self.created.set()
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._check(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._check(event.dest_path)
+
+def _find_latest_mp3(output_path: str, pre_existing=None) -> Optional[str]:
     """
-    Extract audio from YouTube video using stealth browser automation.
-    
+    Return the newest .mp3 in output_path, or None.
+    Names in pre_existing are skipped so concurrent or stale downloads
+    sharing the directory are never mistaken for this one. One scandir
+    pass using the stat info cached on each dirent, instead of a listdir
+    list plus a separate stat() per candidate.
+    """
+    if pre_existing is None:
+        pre_existing = set()
+    latest = None
+    latest_t = -1.0
+    with os.scandir(output_path) as it:
+        for entry in it:
+            if entry.name.endswith('.mp3') and entry.name not in pre_existing:
+                t = entry.stat().st_ctime
+                if t > latest_t:
+                    latest_t = t
+                    latest = entry.path
+    return latest
+
+def _wait_for_mp3(output_path: str, max_wait: int = 60,
+                  log_progress=print, pre_existing=None) -> Optional[str]:
+    """
+    Block until a new .mp3 appears in output_path or max_wait elapses.
+    Files named in pre_existing (a snapshot taken before the conversion
+    started) are ignored, so another job's download in the shared
+    directory can't satisfy this wait. Uses filesystem notifications so
+    the wait returns the moment the file lands instead of on the next
+    poll tick; falls back to the old polling loop when watchdog isn't
+    installed.
+    """
+    if Observer is None:
+        # Polling fallback, with periodic progress reports
+        start_time = time.time()
+        last_progress = 0
+        while time.time() - start_time < max_wait:
+            progress_percent = int(((time.time() - start_time) / max_wait) * 100)
+            if progress_percent >= last_progress + 10:
+                last_progress = progress_percent
+                if progress_percent < 90:  # Don't show 90%+ unless actually done
+                    log_progress(f"Still working... {progress_percent}% of timeout...")
+            latest_file = _find_latest_mp3(output_path, pre_existing)
+            if latest_file:
+                return latest_file
+            time.sleep(random.uniform(0.8, 1.5))
+        return None
+
+    handler = _Mp3CreatedHandler(pre_existing or set())
+    observer = Observer()
+    observer.schedule(handler, output_path, recursive=False)
+    observer.start()
+    try:
+        # The file may have landed before the watch was armed
+        latest_file = _find_latest_mp3(output_path, pre_existing)
+        if latest_file:
+            return latest_file
+        deadline = time.time() + max_wait
+        last_progress = 0
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            # Wake at most once a second so progress still reaches the UI
+            if handler.created.wait(timeout=min(1.0, remaining)):
+                return handler.path
+            progress_percent = int(((max_wait - remaining) / max_wait) * 100)
+            if progress_percent >= last_progress + 10 and progress_percent < 90:
+                last_progress = progress_percent
+                log_progress(f"Still working... {progress_percent}% of timeout...")
+    finally:
+        observer.stop()
+        observer.join(timeout=2)
+
+# Lazily created driver reused by extract_audio_stealth across calls, so
+# Chrome startup and the CDP fingerprint injection cost once per process.
+# Server code with real concurrency uses BrowserPool instead.
+_DRIVER: Optional[webdriver.Chrome] = None
+_DRIVER_LOCK = threading.Lock()
+
+def _get_driver(download_path: str) -> webdriver.Chrome:
+    """
+    Return the shared stealth driver, creating it on first use.
+    Re-points Chrome's download directory via CDP on reuse, since the
+    driver may have been created for a different output path.
+    """
+    global _DRIVER
+    with _DRIVER_LOCK:
+        if _DRIVER is None:
+            _DRIVER = setup_stealth_driver(download_path)
+        else:
+            _DRIVER.execute_cdp_cmd('Page.setDownloadBehavior', {
+                'behavior': 'allow',
+                'downloadPath': download_path,
+            })
+        return _DRIVER
+
+def _discard_driver(driver: webdriver.Chrome) -> None:
+    """Quit a broken shared driver so the next call creates a fresh one."""
+    global _DRIVER
+    with _DRIVER_LOCK:
+        if _DRIVER is driver:
+            _DRIVER = None
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+def _shutdown_shared_driver() -> None:
+    """Quit the shared driver on interpreter exit."""
+    if _DRIVER is not None:
+        _discard_driver(_DRIVER)
+
+atexit.register(_shutdown_shared_driver)
+
+def extract_audio_stealth_with_driver(driver: webdriver.Chrome, url: str, output_path: str,
+                                      progress_callback=None) -> Optional[str]:
+    """
+    Extract audio from YouTube video using an already-running stealth driver.
+    The caller owns the driver's lifetime; this function never quits it.
+
     Args:
+        driver: Configured Chrome WebDriver instance
         url: YouTube video URL
         output_path: Directory where the audio file will be saved
         progress_callback: Optional callback function to report progress
-        
+
     Returns:
         Path to the downloaded audio file or None if extraction fails
     """
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     def log_progress(message: str):
         """Helper to handle progress updates"""
         print(message)  # Still log to console
         if progress_callback:
             progress_callback(message)
-    
+
     try:
         # Create output directory if it doesn't exist
         os.makedirs(output_path, exist_ok=True)
-        
+
+        # Snapshot the shared directory so only this job's download is
+        # matched, not another job's (or a stale) file
+        pre_existing = set(os.listdir(output_path))
+
         # Extract video ID
         video_id = get_video_id(url)
         if not video_id:
             log_progress("Invalid YouTube URL")
             return None
-        
-        # Set up stealth browser
-        log_progress("Setting up secure browser environment...")
-        driver = setup_stealth_driver(os.path.abspath(output_path))
-        
+
         try:
             # Navigate to converter with random timing
             log_progress("Accessing audio converter website... (stealth)")
             driver.get("https://cnvmp3.com/")
             time.sleep(random.uniform(2, 3))  # Initial page load wait
             
-            # Find and interact with URL input
-            url_input = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "input-field-url"))
+            # Find and interact with URL input. Poll at 100ms rather than
+            # the 500ms default, and require visibility so we don't race
+            # a hidden element
+            url_input = WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                EC.visibility_of_element_located((By.CLASS_NAME, "input-field-url"))
             )
             
-            # Clear the input field using JavaScript (more reliable than clear())
-            driver.execute_script("arguments[0].value = '';", url_input)
-            time.sleep(random.uniform(0.3, 0.5))
-            
-            # Verify the field is empty
-            current_value = driver.execute_script("return arguments[0].value;", url_input)
-            if current_value:
+            # Clear the input field and read it back in one atomic script
+            # instead of clear/sleep/read-back round-trips
+            leftover = driver.execute_script(
+                "const el = arguments[0];"
+                "el.value = '';"
+                "el.dispatchEvent(new Event('input', {bubbles: true}));"
+                "return el.value;",
+                url_input)
+            if leftover:
                 log_progress("Clearing previous input...")
                 driver.execute_script("arguments[0].value = '';", url_input)
-                time.sleep(0.5)
-            
-            # Type URL with human-like timing
+
+            # Set the URL in one round-trip through the native value
+            # setter (so framework change-handlers still fire) instead
+            # of a chromedriver command plus sleep per character
             log_progress("Entering YouTube URL...")
-            for char in url:
-                url_input.send_keys(char)
-                time.sleep(random.uniform(0.02, 0.05))
-            
-            # Verify the entered URL
-            entered_url = driver.execute_script("return arguments[0].value;", url_input)
+            entered_url = driver.execute_script(
+                "const el = arguments[0], v = arguments[1];"
+                "const setter = Object.getOwnPropertyDescriptor("
+                "window.HTMLInputElement.prototype, 'value').set;"
+                "setter.call(el, v);"
+                "el.dispatchEvent(new Event('input', {bubbles: true}));"
+                "el.dispatchEvent(new Event('change', {bubbles: true}));"
+                "return el.value;",
+                url_input, url)
+            time.sleep(random.uniform(0.1, 0.3))  # Small post-input jitter
+
+            # The setter script echoes the value back, so verification
+            # needs no extra round-trip
             if entered_url != url:
                 log_progress("Verifying URL input...")
                 driver.execute_script("arguments[0].value = '';", url_input)
                 time.sleep(0.5)
                 url_input.send_keys(url)
             
-            time.sleep(random.uniform(0.7, 1.2))
             simulate_human_interaction(driver)
-            
-            # Click convert button
+
+            # Click convert button; the wait already gates readiness, so
+            # no extra sleep in front of it
             log_progress("Starting audio extraction...")
-            convert_button = WebDriverWait(driver, 10).until(
+            convert_button = WebDriverWait(driver, 10, poll_frequency=0.1).until(
                 EC.element_to_be_clickable((By.ID, "convert-button-1"))
             )
             
@@ -276,44 +495,227 @@ def extract_audio_stealth(url: str, output_path: str, progress_callback=None) ->
             action.click()
             action.perform()
             
-            # Wait for download with random intervals
+            # Wait for the download to land in the output directory
             log_progress("Processing audio... this may take a minute...")
-            max_wait = 60
-            start_time = time.time()
-            last_progress = 0
-            
-            while time.time() - start_time < max_wait:
-                current_time = time.time() - start_time
-                progress_percent = int((current_time / max_wait) * 100)
-                
-                # Update progress every 10%
-                if progress_percent >= last_progress + 10:
-                    last_progress = progress_percent
-                    if progress_percent < 90:  # Don't show 90%+ unless actually done
-                        log_progress(f"Still working... {progress_percent}% of timeout...")
-                
-                files = os.listdir(output_path)
-                mp3_files = [f for f in files if f.endswith('.mp3')]
-                
-                if mp3_files:
-                    latest_file = max([os.path.join(output_path, f) for f in mp3_files],
-                                    key=os.path.getctime)
-                    log_progress("Audio download completed!")
-                    return latest_file
-                
-                time.sleep(random.uniform(0.8, 1.5))
-            
+            latest_file = _wait_for_mp3(output_path, max_wait=60,
+                                        log_progress=log_progress,
+                                        pre_existing=pre_existing)
+            if latest_file:
+                log_progress("Audio download completed!")
+                return latest_file
+
             log_progress("Timeout waiting for download")
             return None
             
         finally:
-            # Final random interaction before closing
+            # Final random interaction before handing the driver back
             simulate_human_interaction(driver)
             time.sleep(random.uniform(0.5, 1))
-            driver.quit()
             log_progress("Cleanup complete")
-            
+
     except Exception as e:
         error_msg = f"Error extracting audio: {str(e)}"
         log_progress(error_msg)
-        return None 
\ No newline at end of file
+        return None
+
+def _extract_audio_with_ytdlp(url: str, output_path: str,
+                              progress_callback=None) -> str:
+    """
+    Download the audio track in-process with yt-dlp, no browser involved.
+    Wires yt-dlp's progress hook through to the caller's callback.
+
+    Args:
+        url: YouTube video URL
+        output_path: Directory where the audio file will be saved
+        progress_callback: Optional callback function to report progress
+
+    Returns:
+        Path to the downloaded mp3
+
+    Raises:
+        Exception: On any yt-dlp extraction or download failure
+    """
+    def _hook(d):
+        if progress_callback and d.get('status') == 'downloading':
+            percent = d.get('_percent_str', '').strip()
+            if percent:
+                progress_callback(f"Downloading audio... {percent}")
+
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': os.path.join(output_path, '%(id)s.%(ext)s'),
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'mp3',
+            # VBR quality 2 (~190 kbps): about twice as fast to encode
+            # as fixed 192k CBR for the same perceived quality
+            'preferredquality': '2',
+        }],
+        # Multi-threaded lame for the unavoidable mp3 encode
+        'postprocessor_args': ['-threads', '0'],
+        'noplaylist': True,
+        'quiet': True,
+        'progress_hooks': [_hook],
+        # Fetch HLS/DASH fragments in parallel and in large chunks so
+        # segmented downloads aren't serialized one fragment at a time
+        'concurrent_fragment_downloads': 8,
+        'http_chunk_size': 10485760,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=True)
+        base = os.path.splitext(ydl.prepare_filename(info))[0]
+    return base + '.mp3'
+
+# The converter's own XHR endpoint, observed from its network traffic.
+# Driving it directly collapses the whole browser pipeline to two HTTP
+# requests when it works
+_CNVMP3_API = "https://cnvmp3.com/download_video_ucep.php"
+
+def _extract_audio_via_api(url: str, output_path: str,
+                           progress_callback=None) -> Optional[str]:
+    """
+    Ask cnvmp3's backend endpoint for the mp3 directly, no browser.
+
+    Args:
+        url: YouTube video URL
+        output_path: Directory where the audio file will be saved
+        progress_callback: Optional callback function to report progress
+
+    Returns:
+        Path to the downloaded mp3, or None if the endpoint refused or
+        its response shape changed
+    """
+    video_id = get_video_id(url)
+    if not video_id:
+        return None
+    if progress_callback:
+        progress_callback("Requesting audio conversion...")
+    try:
+        resp = requests.post(
+            _CNVMP3_API,
+            json={'url': url, 'quality': 5, 'formatValue': 1, 'title': video_id},
+            headers={
+                'User-Agent': get_random_user_agent(),
+                'Referer': 'https://cnvmp3.com/',
+            },
+            timeout=60,
+        )
+        resp.raise_for_status()
+        download_url = resp.json().get('download_link')
+        if not download_url:
+            return None
+
+        output_file = os.path.join(output_path, f"{video_id}.mp3")
+        with requests.get(download_url, stream=True, timeout=60) as stream:
+            stream.raise_for_status()
+            with open(output_file, 'wb') as f:
+                for chunk in stream.iter_content(1 << 20):
+                    f.write(chunk)
+        return output_file
+    except (requests.RequestException, ValueError) as e:
+        print(f"Converter API request failed: {str(e)}")
+        return None
+
+def extract_audio_direct(url: str, output_path: str,
+                         progress_callback=None) -> Optional[str]:
+    """
+    Try the browserless extraction paths: yt-dlp in-process, then the
+    converter's backend endpoint.
+
+    Args:
+        url: YouTube video URL
+        output_path: Directory where the audio file will be saved
+        progress_callback: Optional callback function to report progress
+
+    Returns:
+        Path to the downloaded mp3, or None when both paths are
+        unavailable or failed and the caller should fall back to a browser
+    """
+    os.makedirs(output_path, exist_ok=True)
+
+    if yt_dlp is not None:
+        try:
+            return _extract_audio_with_ytdlp(url, output_path, progress_callback)
+        except Exception as e:
+            print(f"yt-dlp extraction failed: {str(e)}. Falling back to converter API.")
+            if progress_callback:
+                progress_callback("Direct download failed, trying converter website...")
+
+    return _extract_audio_via_api(url, output_path, progress_callback)
+
+def extract_audio_stealth(url: str, output_path: str, progress_callback=None) -> Optional[str]:
+    """
+    Extract audio from a YouTube video.
+    Downloads directly with yt-dlp when available, then tries the
+    converter's backend endpoint over plain HTTP; the stealth browser
+    flow remains as the last resort. The
+    fallback reuses one shared driver across calls; callers that need
+    concurrent extractions should check drivers out of a BrowserPool
+    and use extract_audio_stealth_with_driver instead.
+
+    Args:
+        url: YouTube video URL
+        output_path: Directory where the audio file will be saved
+        progress_callback: Optional callback function to report progress
+
+    Returns:
+        Path to the downloaded audio file or None if extraction fails
+    """
+    # Reject non-YouTube and malformed URLs before any extractor --
+    # especially the browser fallback -- spends real resources on them
+    if not is_valid_youtube_url(url):
+        print("Invalid YouTube URL")
+        if progress_callback:
+            progress_callback("Invalid YouTube URL")
+        return None
+
+    audio_file = extract_audio_direct(url, output_path, progress_callback)
+    if audio_file:
+        return audio_file
+
+    if progress_callback:
+        progress_callback("Setting up secure browser environment...")
+    try:
+        driver = _get_driver(os.path.abspath(output_path))
+    except Exception as e:
+        print(f"Error setting up stealth driver: {str(e)}")
+        return None
+    try:
+        result = extract_audio_stealth_with_driver(driver, url, output_path, progress_callback)
+    except Exception:
+        _discard_driver(driver)
+        raise
+    try:
+        # Park the driver clean for the next call instead of quitting it
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    except Exception as e:
+        print(f"Discarding shared driver after reset failure: {str(e)}")
+        _discard_driver(driver)
+    return result
+
+async def extract_many(urls: List[str], output_path: str,
+                       concurrency: int = 4,
+                       progress_callback=None) -> List[Optional[str]]:
+    """
+    Extract audio for several URLs concurrently.
+    The workload is I/O-dominated, so each extraction runs in a worker
+    thread with a semaphore bounding how many are in flight at once.
+
+    Args:
+        urls: YouTube video URLs
+        output_path: Directory where the audio files will be saved
+        concurrency: Maximum number of simultaneous extractions
+        progress_callback: Optional callback function to report progress
+
+    Returns:
+        One result per input URL, in order; None where extraction failed
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(url: str) -> Optional[str]:
+        async with sem:
+            return await asyncio.to_thread(
+                extract_audio_stealth, url, output_path, progress_callback)
+
+    return await asyncio.gather(*(_one(url) for url in urls))
\ No newline at end of file